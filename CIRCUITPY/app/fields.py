@@ -0,0 +1,188 @@
+# -----------------------------------------------------------------------------
+# Module: Field Extraction – Declarative JSON → Values Mapping
+#
+# Purpose
+# -------
+# The Solar Manager `/v2/point` payload is a flat dict of top-level values
+# (cW, pW, soc, ...) plus a `devices` list with one dict per device. This module
+# turns a small declarative *field spec* into an extractor that pulls all the
+# values the display needs out of one payload.
+#
+# The spec is compiled ONCE at boot. Each poll then costs:
+#   • one dict lookup per top-level field
+#   • a single pass over `devices[]` for all device fields together
+#
+# Field spec
+# ----------
+# A spec is a sequence of (name, path, scale, default) tuples:
+#
+#     ("house", "cW",                  1.0, 0.0)   → payload["cW"] * 1.0
+#     ("water", "68fb58.temperature",  1.0, 0.0)   → device _id "68fb58", key "temperature"
+#
+# Paths without a dot are top-level keys. Paths of the form `<device_id>.<field>`
+# are looked up in the device whose `_id` matches. The placeholder `{TEMP_ID}`
+# is replaced by SOLAR_MANAGER_DEVICE_TEMP_ID from settings.toml.
+#
+# The same spec can be written as a single string in settings.toml:
+#
+#     SOLAR_MANAGER_FIELDS = "house=cW;solar=pW;grid=gW*0.001;water={TEMP_ID}.temperature"
+#
+# `*<number>` is an optional unit scale (e.g. W → kW). Defaults are 0.
+#
+# Multiple endpoints
+# ------------------
+# When several endpoints are polled (see net.FetchCoordinator), a path can be
+# prefixed with the endpoint name: "tariff:price" or "sm2:68fb58.temperature".
+# Paths without a prefix read from the primary endpoint. Use
+# `extract_snapshot({name: payload, ...})` in that case.
+#
+# Device position hints
+# ---------------------
+# Devices usually keep their position in `devices[]` between polls. The
+# extractor remembers the last index where each device id was found and checks
+# that slot first. Only ids that moved (or were never seen) trigger the scan,
+# and the scan stops as soon as every wanted id has been found.
+# -----------------------------------------------------------------------------
+
+
+def parse_spec(text: str) -> list:
+    """
+    Parse a settings.toml field spec string into (name, path, scale, default) tuples.
+
+    Format:  "name=path[*scale];name=path[*scale];..."
+    Whitespace around items is ignored; empty items are skipped.
+    {TEMP_ID} placeholders are kept; FieldExtractor resolves them.
+    Raises ValueError on malformed items.
+    """
+    spec = []
+    for item in text.split(";"):
+        item = item.strip()
+        if not item:
+            continue
+        if "=" not in item:
+            raise ValueError("Field spec item needs name=path: " + item)
+        name, path = item.split("=", 1)
+        scale = 1.0
+        if "*" in path:
+            path, s = path.split("*", 1)
+            scale = float(s)
+        spec.append((name.strip(), path.strip(), scale, 0.0))
+    return spec
+
+
+def _resolve_placeholders(spec, temp_id: str) -> list:
+    """Substitute {TEMP_ID}; drop device fields whose id is still unknown."""
+    out = []
+    for name, path, scale, default in spec:
+        if "{TEMP_ID}" in path:
+            if not temp_id:
+                # No device configured: keep the field at its default value.
+                out.append((name, "", scale, default))
+                continue
+            path = path.replace("{TEMP_ID}", temp_id)
+        out.append((name, path, scale, default))
+    return out
+
+
+class FieldExtractor:
+    """Compiled field spec: extracts all configured values from one payload."""
+
+    def __init__(self, spec, temp_id: str = ""):
+        spec = _resolve_placeholders(spec, temp_id)
+
+        # Output order follows the spec; `names` lets callers map back by name.
+        self.names = tuple(name for name, _, _, _ in spec)
+        self._defaults = [default for _, _, _, default in spec]
+
+        # Compiled fields per source endpoint ("" = primary):
+        #   { source: (top, dev, hint) }
+        #   top  : [(slot, key, scale), ...]               top-level fields
+        #   dev  : { device_id: [(slot, key, scale), ...] } device fields by id
+        #   hint : { device_id: last index in payload["devices"] }
+        self._sources = {}
+
+        for slot, (name, path, scale, _) in enumerate(spec):
+            if not path:
+                continue
+            source = ""
+            if ":" in path:
+                source, path = path.split(":", 1)
+            top, dev, hint = self._sources.setdefault(source, ([], {}, {}))
+            if "." in path:
+                dev_id, key = path.split(".", 1)
+                dev.setdefault(dev_id, []).append((slot, key, scale))
+                hint[dev_id] = -1
+            else:
+                top.append((slot, path, scale))
+
+    def extract(self, payload: dict) -> list:
+        """
+        Return a list of values in spec order, read from a single payload.
+
+        Missing keys, unknown devices, or non-numeric values fall back to the
+        field's default, so a partial payload never breaks the display.
+        Fields with an endpoint prefix keep their default here.
+        """
+        return self.extract_snapshot({"": payload}, "")
+
+    def extract_snapshot(self, snapshot: dict, primary: str) -> list:
+        """
+        Return a list of values in spec order from a merged snapshot
+        {endpoint name: payload}. Unprefixed paths read from `primary`.
+        """
+        values = list(self._defaults)
+        for source, compiled in self._sources.items():
+            payload = snapshot.get(source or primary)
+            if payload:
+                self._extract_source(compiled, payload, values)
+        return values
+
+    def _extract_source(self, compiled, payload: dict, values: list):
+        top, dev, hint = compiled
+        for slot, key, scale in top:
+            v = payload.get(key)
+            if v is not None:
+                try:
+                    values[slot] = float(v) * scale
+                except (TypeError, ValueError):
+                    pass
+
+        if dev:
+            self._extract_devices(dev, hint, payload.get("devices") or [], values)
+
+    def _extract_devices(self, dev: dict, hint: dict, devices: list, values: list):
+        """Resolve all device fields with one pass over `devices`."""
+        n = len(devices)
+        pending = 0
+
+        # 1) Try each id at its remembered position.
+        for dev_id, fields in dev.items():
+            i = hint[dev_id]
+            if 0 <= i < n and devices[i].get("_id") == dev_id:
+                self._apply(devices[i], fields, values)
+            else:
+                hint[dev_id] = -1
+                pending += 1
+
+        # 2) Single scan for ids that moved or were never seen; stop early.
+        if pending:
+            for i in range(n):
+                dev_id = devices[i].get("_id")
+                fields = dev.get(dev_id)
+                if fields is None or hint[dev_id] >= 0:
+                    continue
+                hint[dev_id] = i
+                self._apply(devices[i], fields, values)
+                pending -= 1
+                if not pending:
+                    break
+
+    @staticmethod
+    def _apply(device: dict, fields, values: list):
+        for slot, key, scale in fields:
+            v = device.get(key)
+            if v is not None:
+                try:
+                    values[slot] = float(v) * scale
+                except (TypeError, ValueError):
+                    pass
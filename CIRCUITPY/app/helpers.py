@@ -16,9 +16,6 @@
 #
 # Functions in this file
 # ----------------------
-# load_icon(path)
-#     Load a BMP file from disk and wrap it in a TileGrid ready for placement.
-#
 # right_align_label(label, display_width, right_margin, top_y, row_h)
 #     Align a label’s right edge to the display’s right side and vertically
 #     center it in the row between top_y and top_y + row_h.
@@ -30,32 +27,37 @@
 #     Build a 3×3 TileGrid bitmap that looks like a small ° (degree) dot,
 #     using a transparent background.
 #
-# make_label(color)
-#     Create a text label using the default `terminalio` font and a given color.
+# get_font()
+#     Return the UI font: `terminalio.FONT`, or the bitmap font from
+#     C.FONT_PATH with all glyphs the UI can show preloaded at boot.
+#
+# make_number_field(color, max_chars)
+#     Create a SpriteText: a fixed-width text field drawn from a glyph atlas
+#     that is rasterized once. Updating it only rewrites tile indices.
+#
+# dim_color(color, factor)
+#     Scale an RGB888 color by a brightness factor (software dimming).
+#
+# dim_palette(palette, factor)
+#     Return a new Palette with every color scaled by factor.
+#
+# load_icon_indexed(path)
+#     Load a BMP into RAM as an indexed Bitmap + Palette so its colors can be
+#     swapped for a precomputed dimmed palette.
 # -----------------------------------------------------------------------------
 
+import gc
 import displayio
-from adafruit_display_text import bitmap_label
 import terminalio
 import config as C
 
-
-def load_icon(path: str) -> displayio.TileGrid:
-    """
-    Load a BMP icon from the filesystem and return it as a TileGrid.
-
-    The returned TileGrid can be positioned on screen using .x and .y.
-
-    Example:
-        house = load_icon("/app/assets/icon-house.bmp")
-        house.x, house.y = 0, 0
-        root.append(house)
-    """
-    odb = displayio.OnDiskBitmap(path)
-    return displayio.TileGrid(odb, pixel_shader=odb.pixel_shader, x=0, y=0)
+# The UI font is loaded once on first use (see get_font()).
+_font = None
+# The glyph atlas for number fields is rasterized once on first use (see get_atlas()).
+_atlas = None
 
 
-def right_align_label(lbl: bitmap_label.Label,
+def right_align_label(lbl,
                       display_width: int,
                       right_margin: int,
                       top_y: int,
@@ -66,7 +68,7 @@ def right_align_label(lbl: bitmap_label.Label,
 
     Parameters
     ----------
-    lbl : bitmap_label.Label
+    lbl : bitmap_label.Label or SpriteText
         The label object to position.
     display_width : int
         Total display width in pixels (e.g., 64 for a 64×32 matrix).
@@ -93,7 +95,7 @@ def right_align_label(lbl: bitmap_label.Label,
     lbl.y = top_y + (row_h // 2) - (bb[3] // 2) - bb[1]
 
 
-def vcenter_label(lbl: bitmap_label.Label, top_y: int, row_h: int):
+def vcenter_label(lbl, top_y: int, row_h: int):
     """
     Vertically center a label in a rectangular row of height row_h.
 
@@ -134,17 +136,348 @@ def make_degree_dot(color=C.COL_RED) -> displayio.TileGrid:
     return displayio.TileGrid(bmp, pixel_shader=pal, x=0, y=0)
 
 
-def make_label(color: int) -> bitmap_label.Label:
+def dim_color(color: int, factor: float) -> int:
+    """
+    Scale each channel of an RGB888 color by `factor` (0.0 .. 1.0).
+
+    The panel only shows the top C.MATRIX_BIT_DEPTH bits of each channel
+    (with depth 2: 0x00, 0x40, 0x80, 0xC0). Each scaled channel is rounded to
+    the nearest of these levels, so weak channels drop out and the hue is
+    kept. If that would turn a lit color off completely, its strongest
+    channel(s) are kept at the lowest visible level instead.
+
+    Example (bit depth 2):
+        dim_color(0xFFFF00, 0.34) → 0x404000
+        dim_color(0xB4B4B4, 0.34) → 0x404040
+        dim_color(0x50C8FF, 0.34) → 0x004040   (ice blue stays cyan)
+    """
+    if factor <= 0:
+        return 0x000000
+    step = 0x100 >> C.MATRIX_BIT_DEPTH
+    top = 0x100 - step
+    channels = [(color >> shift) & 0xFF for shift in (16, 8, 0)]
+    dimmed = [min(int(c * factor + step // 2) // step * step, top) for c in channels]
+
+    if not any(dimmed):
+        # Too dark for the panel: light only the dominant channel(s)
+        peak = max(channels)
+        dimmed = [step if peak and c == peak else 0 for c in channels]
+
+    return (dimmed[0] << 16) | (dimmed[1] << 8) | dimmed[2]
+
+
+def dim_palette(pal: displayio.Palette, factor: float) -> displayio.Palette:
+    """
+    Return a copy of `pal` with every color scaled by `factor`.
+
+    Transparent entries stay transparent. Build this once and swap it in via
+    `tilegrid.pixel_shader = ...` instead of recomputing colors every frame.
+    """
+    n = len(pal)
+    out = displayio.Palette(n)
+    for i in range(n):
+        out[i] = dim_color(pal[i], factor)
+        if pal.is_transparent(i):
+            out.make_transparent(i)
+    return out
+
+
+def load_icon_indexed(path: str):
+    """
+    Load a BMP icon into RAM as an indexed bitmap.
+
+    Our icons are stored as 24/32-bit BMPs, so `OnDiskBitmap` would use a
+    ColorConverter whose colors cannot be changed. Here we read the pixels once
+    and build a small Palette of the distinct colors (the icons use a handful).
+
+    Returns
+    -------
+    tuple : (displayio.Bitmap, displayio.Palette)
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    offset = int.from_bytes(data[10:14], "little")
+    w = int.from_bytes(data[18:22], "little")
+    h = int.from_bytes(data[22:26], "little")
+    bpp = int.from_bytes(data[28:30], "little")
+    if bpp not in (24, 32):
+        raise ValueError("Unsupported BMP bit depth: %d" % bpp)
+
+    top_down = h >= 0x80000000           # negative height → rows stored top-down
+    if top_down:
+        h = 0x100000000 - h
+    step = bpp // 8
+    stride = (w * step + 3) & ~3          # rows are padded to 4 bytes
+
+    colors = []
+    pixels = []
+    for y in range(h):
+        row = offset + (y if top_down else h - 1 - y) * stride
+        for x in range(w):
+            i = row + x * step
+            c = (data[i + 2] << 16) | (data[i + 1] << 8) | data[i]   # BGR(A) → RGB888
+            if c not in colors:
+                colors.append(c)
+            pixels.append(colors.index(c))
+
+    bmp = displayio.Bitmap(w, h, max(2, len(colors)))
+    for i, idx in enumerate(pixels):
+        bmp[i % w, i // w] = idx
+
+    pal = displayio.Palette(len(colors))
+    for i, c in enumerate(colors):
+        pal[i] = c
+    return bmp, pal
+
+
+class PreloadedFont:
+    """
+    A bitmap font whose glyphs were all loaded at boot.
+
+    `adafruit_bitmap_font` reads glyphs lazily from flash the first time they
+    are drawn, which stalls the display when a new digit appears. This wrapper
+    holds only the preloaded glyphs in a fixed dict, so drawing never touches
+    the filesystem. Characters outside the preloaded set return None and are
+    skipped by `bitmap_label`.
+    """
+
+    # bitmap_label measures the line height with these sample glyphs
+    MEASURE_GLYPHS = "M j'"
+
+    def __init__(self, font, glyphs: str):
+        glyphs += self.MEASURE_GLYPHS
+        font.load_glyphs(glyphs)
+        self._glyphs = {}
+        for ch in glyphs:
+            g = font.get_glyph(ord(ch))
+            if g is not None:
+                self._glyphs[ord(ch)] = g
+        self._bbox = font.get_bounding_box()
+
+        # Provide ascent/descent directly, like the built-in fonts do
+        ascent = descent = 0
+        for ch in self.MEASURE_GLYPHS:
+            g = self._glyphs.get(ord(ch))
+            if g is not None:
+                ascent = max(ascent, g.height + g.dy)
+                descent = max(descent, -g.dy)
+        self.ascent = ascent
+        self.descent = descent
+
+    def get_bounding_box(self):
+        return self._bbox
+
+    def get_glyph(self, code: int):
+        return self._glyphs.get(code)
+
+    def __len__(self):
+        return len(self._glyphs)
+
+
+def load_font(path: str, glyphs: str) -> PreloadedFont:
+    """
+    Load a BDF/PCF/LVGL font and preload exactly the given glyphs.
+
+    Prints how many glyphs were loaded and how much heap the font uses,
+    so the cost of a larger font is visible on the serial console.
+    """
+    from adafruit_bitmap_font import bitmap_font   # only needed for custom fonts
+
+    gc.collect()
+    free_before = gc.mem_free()
+    font = PreloadedFont(bitmap_font.load_font(path), glyphs)
+    gc.collect()
+    used = free_before - gc.mem_free()
+    print("Font", path, "-", len(font), "glyphs,", used, "bytes")
+    return font
+
+
+def get_font():
+    """
+    Return the font used for all UI labels.
+
+    Without C.FONT_PATH this is the built-in `terminalio.FONT`. Otherwise the
+    font file is loaded once with C.FONT_GLYPHS preloaded; if loading fails we
+    fall back to the built-in font so the display keeps working.
+    """
+    global _font
+    if _font is None:
+        _font = terminalio.FONT
+        if C.FONT_PATH:
+            try:
+                _font = load_font(C.FONT_PATH, C.FONT_GLYPHS)
+            except (OSError, ValueError, MemoryError) as e:
+                print("Font load failed:", e)
+    return _font
+
+
+class GlyphAtlas:
+    """
+    All characters the number fields can show, rasterized once into one Bitmap.
+
+    Each character occupies one fixed-size cell (the widest glyph × line height),
+    laid out left to right, so a TileGrid can show character `ch` by setting a
+    tile to `index[ch]`. Pixel value 1 = ink, 0 = background (transparent).
+    """
+
+    def __init__(self, font, chars: str):
+        if " " not in chars:
+            chars = " " + chars          # the blank tile is needed for padding
+
+        glyphs = [font.get_glyph(ord(ch)) for ch in chars]
+        if not any(g is not None for g in glyphs) and font is not terminalio.FONT:
+            # A custom font without any of our characters: use the built-in one
+            print("Font has none of", repr(chars), "- using terminalio")
+            font = terminalio.FONT
+            glyphs = [font.get_glyph(ord(ch)) for ch in chars]
+
+        # Line metrics, measured the same way bitmap_label does
+        if hasattr(font, "ascent"):
+            ascent, descent = font.ascent, font.descent
+        else:
+            ascent = descent = 0
+            for ch in "M j'":
+                g = font.get_glyph(ord(ch))
+                if g is not None:
+                    ascent = max(ascent, g.height + g.dy)
+                    descent = max(descent, -g.dy)
+
+        self.cell_w = max(max(g.shift_x, g.width) for g in glyphs if g is not None)
+        self.cell_h = ascent + descent
+        self.bitmap = displayio.Bitmap(self.cell_w * len(chars), self.cell_h, 2)
+        self.index = {}
+        # Rows of the cell that actually contain ink (top inclusive, bottom exclusive)
+        self.ink_top, self.ink_bottom = self.cell_h, 0
+
+        for i, (ch, g) in enumerate(zip(chars, glyphs)):
+            self.index[ch] = i
+            if g is None or g.width == 0 or g.height == 0:
+                continue                 # missing or empty glyph (e.g. BDF space): nothing to draw
+            # Glyph source: built-in fonts share one bitmap of tiles, bitmap fonts
+            # have one bitmap per glyph (tile_index 0).
+            per_row = g.bitmap.width // g.width
+            sx = (g.tile_index % per_row) * g.width
+            sy = (g.tile_index // per_row) * g.height
+            # Destination: glyph offset inside the cell, baseline at `ascent`
+            dx = i * self.cell_w + g.dx
+            dy = ascent - g.height - g.dy
+            for y in range(g.height):
+                ty = dy + y
+                if not 0 <= ty < self.cell_h:
+                    continue
+                for x in range(g.width):
+                    tx = dx + x
+                    if i * self.cell_w <= tx < (i + 1) * self.cell_w and g.bitmap[sx + x, sy + y]:
+                        self.bitmap[tx, ty] = 1
+                        self.ink_top = min(self.ink_top, ty)
+                        self.ink_bottom = max(self.ink_bottom, ty + 1)
+
+        self.blank = self.index[" "]
+
+
+def _atlas_fits(atlas: GlyphAtlas) -> bool:
+    """
+    Check that number fields drawn from `atlas` fit the 64×32 layout:
+      • the ink stays inside a TOP_ICON_H row when vcenter_label() centers
+        the cell in it (blank rows above/below the glyphs may overlap), and
+      • POWER_MAX_CHARS cells fit between the row icon and the right margin.
+    """
+    top = C.TOP_ICON_H // 2 - atlas.cell_h // 2
+    free_w = (C.DISPLAY_W - C.LEFT_MARGIN - C.TOP_ICON_W
+              - C.GAP_ICON_TEXT - C.RIGHT_MARGIN)
+    return (top + atlas.ink_top >= 0
+            and top + atlas.ink_bottom <= C.TOP_ICON_H
+            and C.POWER_MAX_CHARS * atlas.cell_w <= free_w)
+
+
+def get_atlas() -> GlyphAtlas:
+    """
+    Return the glyph atlas for C.FONT_GLYPHS in the UI font (built once).
+
+    A custom font (C.FONT_PATH) whose digits don't fit the layout is rejected
+    with a printed warning and the built-in terminalio font is used instead.
+    """
+    global _atlas, _font
+    if _atlas is None:
+        font = get_font()
+        _atlas = GlyphAtlas(font, C.FONT_GLYPHS)
+        if font is not terminalio.FONT and not _atlas_fits(_atlas):
+            print("Font %s too large (cell %dx%d px); using terminalio"
+                  % (C.FONT_PATH, _atlas.cell_w, _atlas.cell_h))
+            _font = terminalio.FONT
+            _atlas = GlyphAtlas(_font, C.FONT_GLYPHS)
+    return _atlas
+
+
+class SpriteText(displayio.Group):
     """
-    Create a simple text label using the built-in terminal font.
+    A fixed-width text field that draws characters from a GlyphAtlas.
+
+    Behaves like a label for our layout code: it has `.text`, `.color`, `.x`,
+    `.y` and a `bounding_box` (0, 0, width of the current text, line height),
+    so `right_align_label()` and `vcenter_label()` work unchanged.
 
-    Returns a bitmap_label.Label that starts with empty text and the
-    specified color. The text can later be updated with .text = "new value".
+    Setting `.text` writes one tile index per character — no text bitmap is
+    allocated or rasterized. Characters not in the atlas show as blank, and
+    text longer than `max_chars` is cut off.
+    """
+
+    def __init__(self, atlas: GlyphAtlas, max_chars: int, color: int):
+        super().__init__()
+        self._atlas = atlas
+        self._len = 0
+        self._text = ""
+
+        self._palette = displayio.Palette(2)
+        self._palette[0] = 0x000000
+        self._palette[1] = color
+        self._palette.make_transparent(0)
+
+        self._grid = displayio.TileGrid(atlas.bitmap, pixel_shader=self._palette,
+                                        width=max_chars, height=1,
+                                        tile_width=atlas.cell_w, tile_height=atlas.cell_h,
+                                        default_tile=atlas.blank)
+        self.append(self._grid)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        if value == self._text:
+            return
+        grid, index, blank = self._grid, self._atlas.index, self._atlas.blank
+        n = min(len(value), grid.width)
+        for i in range(n):
+            grid[i] = index.get(value[i], blank)
+        for i in range(n, self._len):     # clear leftovers of a longer old text
+            grid[i] = blank
+        self._len = n
+        self._text = value
+
+    @property
+    def color(self) -> int:
+        return self._palette[1]
+
+    @color.setter
+    def color(self, value: int):
+        self._palette[1] = value
+
+    @property
+    def bounding_box(self):
+        return (0, 0, self._len * self._atlas.cell_w, self._atlas.cell_h)
+
+
+def make_number_field(color: int, max_chars: int) -> SpriteText:
+    """
+    Create a SpriteText for numbers/units using the shared glyph atlas.
 
     Example:
-        lbl = make_label(C.COL_WHITE)
-        lbl.text = "123 W"
-        lbl.x, lbl.y = 10, 5
+        lbl = make_number_field(C.COL_WHITE, 8)
+        lbl.text = "10.2 kW"
+        right_align_label(lbl, 64, 1, 0, 10)
         root.append(lbl)
     """
-    return bitmap_label.Label(terminalio.FONT, text="", scale=1, color=color)
+    return SpriteText(get_atlas(), max_chars, color)
@@ -0,0 +1,131 @@
+# -----------------------------------------------------------------------------
+# Module: Night Mode – Schedule / No-PV Detection and Poll Stretching
+#
+# Purpose
+# -------
+# The HUB75 panel has practically only "off" or "full brightness", so without
+# help the display runs at full power and full poll rate all night. This module
+# decides *when* it is night; `HomeEnergyUI.set_night()` does the dimming with
+# palettes that were precomputed once at boot.
+#
+# Night starts when either
+#   • the local time is inside [NIGHT_START_H, NIGHT_END_H), or
+#   • solar power (pW) has been zero for NIGHT_PV_ZERO_S seconds.
+#
+# Night ends when
+#   • the scheduled window ends (the no-PV timer is restarted at that moment),
+#   • PV production comes back, or
+#   • house consumption moves by NIGHT_WAKE_DELTA_W or more compared to the
+#     value when night started (someone is up). The display then stays awake
+#     for at least NIGHT_WAKE_HOLD_S seconds.
+#
+# While night mode is active, the main loop polls every NIGHT_POLL_INTERVAL_S
+# instead of POLL_INTERVAL_S, so the ESP32 spends most of the night idle.
+#
+# Local time
+# ----------
+# The board has no battery-backed clock. The ESP32 knows the time via NTP once
+# Wi-Fi is up, so we read it once (`time_source()` → Unix epoch) and from then
+# on derive the time from time.monotonic() — no extra Wi-Fi traffic.
+# UTC_OFFSET_H is a fixed offset; daylight saving time is not handled.
+# If the time is not available, only the no-PV rule applies.
+# -----------------------------------------------------------------------------
+
+import time
+import config as C
+
+
+class NightMode:
+    """Tracks whether the display should be in night mode."""
+
+    def __init__(self, time_source=None):
+        # time_source: callable returning the Unix epoch (seconds), or None
+        self._time_source = time_source
+        # Seconds since midnight UTC (int) and the monotonic() reading at that
+        # moment. The epoch (~1.7e9) never goes through a float: CircuitPython
+        # floats are too coarse for it and would be off by minutes.
+        self._day_s0 = None
+        self._mono0 = 0.0
+        self._next_sync = 0.0
+
+        self.active = False
+        self.polls = 0                # polls while night mode was active
+        self._in_window = False
+        self._pv_zero_since = None
+        self._ref_w = 0.0
+        self._awake_until = 0.0
+
+    # -------------------------------------------------------------------------
+    # Clock
+    # -------------------------------------------------------------------------
+    def _local_hour(self, now: float):
+        """Return the local hour (0.0 .. 24.0) or None if time is unknown."""
+        if self._day_s0 is None:
+            if self._time_source is None or now < self._next_sync:
+                return None
+            try:
+                epoch = int(self._time_source())
+            except Exception:
+                # NTP not synced yet on the ESP32; try again later
+                self._next_sync = now + C.NIGHT_CLOCK_RETRY_S
+                return None
+            self._mono0 = time.monotonic()
+            self._day_s0 = epoch % 86400
+        t = self._day_s0 + int(now - self._mono0) + C.UTC_OFFSET_H * 3600
+        return (t % 86400) / 3600
+
+    def _scheduled(self, now: float) -> bool:
+        if C.NIGHT_START_H is None or C.NIGHT_END_H is None:
+            return False
+        h = self._local_hour(now)
+        if h is None:
+            return False
+        if C.NIGHT_START_H <= C.NIGHT_END_H:
+            return C.NIGHT_START_H <= h < C.NIGHT_END_H
+        return h >= C.NIGHT_START_H or h < C.NIGHT_END_H   # window wraps midnight
+
+    # -------------------------------------------------------------------------
+    # State machine
+    # -------------------------------------------------------------------------
+    def update(self, house_w: float, solar_w: float, now: float = None) -> bool:
+        """
+        Feed the latest values; return True if night mode was switched on or off.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        if self.active:
+            self.polls += 1
+
+        # No-PV timer
+        if solar_w > 0:
+            self._pv_zero_since = None
+        elif self._pv_zero_since is None:
+            self._pv_zero_since = now
+
+        # Schedule; leaving the window restarts the no-PV timer (scheduled wake-up)
+        in_window = self._scheduled(now)
+        if self._in_window and not in_window:
+            self._pv_zero_since = None if solar_w > 0 else now
+        self._in_window = in_window
+
+        no_pv = (self._pv_zero_since is not None
+                 and now - self._pv_zero_since >= C.NIGHT_PV_ZERO_S)
+        want = (in_window or no_pv) and now >= self._awake_until
+
+        # Significant consumption change wakes the display up
+        if self.active and abs(house_w - self._ref_w) >= C.NIGHT_WAKE_DELTA_W:
+            self._awake_until = now + C.NIGHT_WAKE_HOLD_S
+            want = False
+
+        if want == self.active:
+            return False
+        self.active = want
+        if want:
+            self._ref_w = house_w
+            self.polls = 0
+        return True
+
+    def poll_interval(self) -> float:
+        """Seconds between polls for the current mode."""
+        return C.NIGHT_POLL_INTERVAL_S if self.active else C.POLL_INTERVAL_S
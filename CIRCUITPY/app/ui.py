@@ -14,10 +14,13 @@
 # --------------------------------------------
 # • Display root: We create one `displayio.Group()` called `root`. This becomes
 #   the display's scene via `self.display.root_group = root`.
-# • Icons: Small BMPs are loaded from disk using `OnDiskBitmap` and placed as
-#   `displayio.TileGrid` objects. They are appended to `root`.
-# • Text: Numbers and units are `bitmap_label.Label` objects using `terminalio.FONT`.
-#   These are also appended to `root`. We position text by setting `label.x` and `label.y`.
+# • Icons: Small BMPs are loaded once into RAM as indexed bitmaps (bitmap +
+#   palette) and placed as `displayio.TileGrid` objects appended to `root`.
+# • Text: Numbers and units are `SpriteText` fields (see helpers.py). The UI font
+#   (`terminalio.FONT`, or C.FONT_PATH with its glyphs preloaded at boot) is
+#   rasterized once into a glyph atlas; each field is a fixed-width TileGrid whose
+#   tile indices are rewritten when the text changes. Fields behave like labels
+#   (`.text`, `.color`, `bounding_box`) and are positioned via `.x` and `.y`.
 #
 # Placement helpers
 # -----------------
@@ -35,7 +38,7 @@
 # About `bounding_box`
 # --------------------
 # A label’s `bounding_box` is a 4-tuple `(x, y, w, h)`:
-#   - `x`, `y`: internal offsets applied by `bitmap_label` (often 0 or small values)
+#   - `x`, `y`: internal offsets (always 0 for SpriteText; small values for labels)
 #   - `w`, `h`: the label’s pixel width/height for its current text and scale
 # We never draw the bounding box—it's a measurement tool. We use its `w`/`h` to
 # place labels flush to the right and to center them vertically so that numbers line up.
@@ -46,9 +49,15 @@
 #   1) receives new numbers (watts, % SoC, temperature in °C),
 #   2) formats the power values (W vs kW),
 #   3) updates label texts and minor positions,
-#   4) swaps the battery icon + color if SoC < 6%.
+#   4) swaps the battery icon + color if SoC < 10%.
 # No groups are rebuilt during updates—this keeps refreshes smooth and fast.
 #
+# Night mode
+# ----------
+# `set_night(True)` dims the whole scene in software. All dimmed colors and
+# icon palettes are computed once in `__init__()`; switching only swaps
+# references. With `C.NIGHT_DIM = 0` the scene is hidden instead.
+#
 # Configuration
 # -------------
 # All colors, file paths, margins, sizes, and fine-tuning offsets live in `config.py`.
@@ -56,7 +65,8 @@
 # -----------------------------------------------------------------------------
 
 import displayio
-from .helpers import load_icon, right_align_label, vcenter_label, make_degree_dot, make_label
+from .helpers import (right_align_label, vcenter_label, make_degree_dot, make_number_field,
+                      load_icon_indexed, dim_color, dim_palette)
 import config as C
 
 
@@ -66,18 +76,30 @@ class HomeEnergyUI:
     def __init__(self, display):
         # Keep a reference to the display object provided by Matrix().display
         self.display = display
+        self.night = False      # True while the scene is drawn with dimmed colors
+
+        # Precomputed night colors: day color → dimmed color
+        self._night_col = {c: dim_color(c, C.NIGHT_DIM) for c in
+                           (C.COL_WHITE, C.COL_YELLOW, C.COL_GREEN, C.COL_RED, C.COL_BLUE)}
+
+        # Icons: (bitmap, day palette, night palette), loaded once
+        self._icons = {}
+        for path in (C.ICON_HOUSE, C.ICON_SUN, C.ICON_BATT_FULL, C.ICON_BATT_EMPTY, C.ICON_SHOWER):
+            bmp, pal = load_icon_indexed(path)
+            self._icons[path] = (bmp, pal, dim_palette(pal, C.NIGHT_DIM))
 
         # Create a single root group that holds everything drawn on screen.
         # This becomes the scene shown by the display.
         root = displayio.Group()
+        self.root = root
         self.display.root_group = root
 
         # --- Top section: house and solar power (icons on the left, numbers right-aligned) ---
-        self.icon_house = load_icon(C.ICON_HOUSE)
+        self.icon_house = self._make_icon(C.ICON_HOUSE)
         self.icon_house.x = C.LEFT_MARGIN
         self.icon_house.y = C.ROW_Y[0]
 
-        self.icon_solar = load_icon(C.ICON_SUN)
+        self.icon_solar = self._make_icon(C.ICON_SUN)
         self.icon_solar.x = C.LEFT_MARGIN
         self.icon_solar.y = C.ROW_Y[1]
 
@@ -85,24 +107,27 @@ class HomeEnergyUI:
         root.append(self.icon_solar)
 
         # Text labels for the two top rows (numbers only; units handled by formatter)
-        self.lbl_consumption = make_label(C.COL_WHITE)
-        self.lbl_solar = make_label(C.COL_YELLOW)
+        self.lbl_consumption = make_number_field(C.COL_WHITE, C.POWER_MAX_CHARS)
+        self.lbl_solar = make_number_field(C.COL_YELLOW, C.POWER_MAX_CHARS)
         root.append(self.lbl_consumption)
         root.append(self.lbl_solar)
 
         # --- Bottom-left: battery state of charge (icon + "%") ---
-        self.icon_batt = load_icon(C.ICON_BATT_FULL)
+        self._batt_icon = C.ICON_BATT_FULL
+        self._soc_col = C.COL_GREEN
+        self.icon_batt = self._make_icon(C.ICON_BATT_FULL)
         self.icon_batt.y = C.BOTTOM_Y
-        self.lbl_soc = make_label(C.COL_GREEN)
+        self.lbl_soc = make_number_field(C.COL_GREEN, 4)           # up to "100%"
         root.append(self.icon_batt)
         root.append(self.lbl_soc)
 
         # --- Bottom-right: water temperature (icon + number + ° dot + "C") ---
-        self.icon_temp = load_icon(C.ICON_SHOWER)
+        self.icon_temp = self._make_icon(C.ICON_SHOWER)
         self.icon_temp.y = C.BOTTOM_Y
-        self.lbl_temp = make_label(C.COL_BLUE)            # numeric temperature
+        self.lbl_temp = make_number_field(C.COL_BLUE, 3)  # numeric temperature, e.g. "-5" or "100"
         self.deg_dot = make_degree_dot(C.COL_BLUE)        # tiny 3×3 dot right after the number
-        self.lbl_unit = make_label(C.COL_BLUE)            # the letter "C"
+        self._deg_pals = (self.deg_dot.pixel_shader, dim_palette(self.deg_dot.pixel_shader, C.NIGHT_DIM))
+        self.lbl_unit = make_number_field(C.COL_BLUE, 1)  # the letter "C"
         self.lbl_unit.text = "C"
 
         root.append(self.icon_temp)
@@ -110,6 +135,43 @@ class HomeEnergyUI:
         root.append(self.deg_dot)
         root.append(self.lbl_unit)
 
+    # -------------------------------------------------------------------------
+    # Night mode helpers
+    # -------------------------------------------------------------------------
+    def _make_icon(self, path: str) -> displayio.TileGrid:
+        """Create a TileGrid for a preloaded icon (day palette)."""
+        bmp, pal, _ = self._icons[path]
+        return displayio.TileGrid(bmp, pixel_shader=pal, x=0, y=0)
+
+    def _col(self, color: int) -> int:
+        """Return the color to use in the current mode."""
+        return self._night_col[color] if self.night else color
+
+    def _apply_icon(self, tg: displayio.TileGrid, path: str):
+        bmp, day, night = self._icons[path]
+        tg.bitmap = bmp
+        tg.pixel_shader = night if self.night else day
+
+    def set_night(self, night: bool):
+        """Switch between day and night rendering (precomputed palettes only)."""
+        if C.NIGHT_DIM <= 0:
+            # Nothing left to show: hide the whole scene, keep day colors
+            self.root.hidden = night
+            night = False
+        self.night = night
+
+        self._apply_icon(self.icon_house, C.ICON_HOUSE)
+        self._apply_icon(self.icon_solar, C.ICON_SUN)
+        self._apply_icon(self.icon_batt, self._batt_icon)
+        self._apply_icon(self.icon_temp, C.ICON_SHOWER)
+        self.deg_dot.pixel_shader = self._deg_pals[1 if night else 0]
+
+        self.lbl_consumption.color = self._col(C.COL_WHITE)
+        self.lbl_solar.color = self._col(C.COL_YELLOW)
+        self.lbl_soc.color = self._col(self._soc_col)
+        self.lbl_temp.color = self._col(C.COL_BLUE)
+        self.lbl_unit.color = self._col(C.COL_BLUE)
+
     # -------------------------------------------------------------------------
     # Update method – called repeatedly to refresh displayed values
     # -------------------------------------------------------------------------
@@ -150,12 +212,12 @@ class HomeEnergyUI:
         # Choose icon and color based on SoC. Below 10% → red text and empty icon.
         if batt_soc < 10:
             # Critical battery level
-            self.icon_batt.bitmap = displayio.OnDiskBitmap(C.ICON_BATT_EMPTY)
-            self.lbl_soc.color = C.COL_RED
+            self._batt_icon, self._soc_col = C.ICON_BATT_EMPTY, C.COL_RED
         else:
             # Normal battery
-            self.icon_batt.bitmap = displayio.OnDiskBitmap(C.ICON_BATT_FULL)
-            self.lbl_soc.color = C.COL_GREEN
+            self._batt_icon, self._soc_col = C.ICON_BATT_FULL, C.COL_GREEN
+        self._apply_icon(self.icon_batt, self._batt_icon)
+        self.lbl_soc.color = self._col(self._soc_col)
 
         # Update SoC text and position it vertically centered in the bottom row.
         self.lbl_soc.text = f"{int(batt_soc):02d}%"
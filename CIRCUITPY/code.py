@@ -11,9 +11,12 @@
 #       "Connected to <SSID>  IP: <IP>"
 #   If Wi-Fi fails, it scrolls: "Wi-Fi Error – Offline Mode".
 # • Builds the UI once and then, on a fixed schedule:
-#       - fetches JSON from your local API
+#       - fetches JSON from your local API (plus optional extra endpoints,
+#         each on its own period) and merges it into one snapshot
 #       - maps the values into (house W, solar W, batt %, water °C)
+#         using the field spec compiled once at boot (app/fields.py)
 #       - calls ui.update(...) without rebuilding the scene
+#       - switches night mode (dimmed scene, longer poll interval) on/off
 #
 # Where SPI is used (short version)
 # ---------------------------------
@@ -27,6 +30,8 @@
 # WIFI_PASSWORD="..."
 # SOLAR_MANAGER_LOCAL_API_BASE_URL="http://<your-local-solar-manager-ip>/v2/point"
 # SOLAR_MANAGER_DEVICE_TEMP_ID="68fb58..."   # device id that reports temperature
+# SOLAR_MANAGER_FIELDS="house=cW;solar=pW;..." # optional field spec override
+# SOLAR_MANAGER_EXTRA_ENDPOINTS="tariff=http://.../tariff@900"  # optional
 #
 # Files
 # -----
@@ -34,26 +39,44 @@
 # config.py         : colors, icons, layout, nudges (visuals only)
 # app/ui.py         : scene construction + update logic
 # app/helpers.py    : small UI helpers (icons, alignment, degree dot, labels)
-# app/net.py        : ESP32 over SPI, Wi-Fi connect, HTTP session, fetch_json
+# app/net.py        : ESP32 over SPI, Wi-Fi connect, HTTP session (keep-alive), fetch_json
+# app/fields.py     : compiled field spec → values extractor
+# app/night.py      : night mode schedule / no-PV detection, poll stretching
 # app/assets/*.bmp  : icon bitmaps
 # -----------------------------------------------------------------------------
 
-import os, time, displayio, terminalio
+import gc, time
+T_START = time.monotonic()   # boot timing reference (see "Boot report" below)
+
+import os, displayio, terminalio
 from adafruit_display_text import bitmap_label
 from adafruit_matrixportal.matrix import Matrix
 
-from app.ui import HomeEnergyUI
-from app import net
+from app import net          # light: the ESP32/HTTP libraries load on first use
 import config as C
 
+gc.collect()
+print("Boot: imports %.2f s, free %d bytes" % (time.monotonic() - T_START, gc.mem_free()))
+
 
 # -------------------- Display init --------------------
 displayio.release_displays()
-display = Matrix().display
+display = Matrix(bit_depth=C.MATRIX_BIT_DEPTH).display
 W, H = display.width, display.height
 
 
-# -------------------- Startup scrolling banner --------------------
+# -------------------- Startup screens --------------------
+def show_static(text: str, color: int = C.COL_WHITE):
+    """Show a single centered line of text (e.g. while Wi-Fi connects)."""
+    group = displayio.Group()
+    label = bitmap_label.Label(terminalio.FONT, text=text, color=color)
+    bb = label.bounding_box
+    label.x = (W // 2) - (bb[2] // 2) - bb[0]
+    label.y = (H // 2) - (bb[3] // 2) - bb[1]
+    group.append(label)
+    display.root_group = group
+
+
 def scroll_once(text: str, color: int = C.COL_WHITE, step_px: int = 1, step_delay_s: float = 0.03):
     """
     Scroll a single line of ASCII text (A–Z, 0–9, etc.) across the display once.
@@ -76,17 +99,32 @@ def scroll_once(text: str, color: int = C.COL_WHITE, step_px: int = 1, step_dela
 # -------------------- Networking knobs --------------------
 API_URL         = os.getenv("SOLAR_MANAGER_LOCAL_API_BASE_URL") or ""
 DEVICE_TEMP_ID  = os.getenv("SOLAR_MANAGER_DEVICE_TEMP_ID") or ""
+EXTRA_ENDPOINTS = os.getenv("SOLAR_MANAGER_EXTRA_ENDPOINTS") or ""
+PRIMARY         = "point"   # endpoint name of API_URL in the snapshot
 
 
 # -------------------- Wi-Fi connect + banner --------------------
+# Show something right away: loading the ESP32 driver and joining Wi-Fi can
+# take several seconds.
+show_static("Connecting...")
+t_wifi = time.monotonic()
 try:
     ssid, ip = net.connect_and_get_ip()
-    scroll_once(f"Connected to {ssid}  IP: {ip}  ", color=C.COL_WHITE)
+    banner = f"Connected to {ssid}  IP: {ip}  "
 except Exception:
-    scroll_once("Wi-Fi Error – Offline Mode  ", color=C.COL_WHITE)
+    banner = "Wi-Fi Error – Offline Mode  "
+T_WIFI = time.monotonic() - t_wifi
+t_banner = time.monotonic()
+scroll_once(banner, color=C.COL_WHITE)
+T_BANNER = time.monotonic() - t_banner
 
 
 # -------------------- Build UI -------------------------
+# Imported here, after the banner, so the first pixels show up sooner.
+from app.ui import HomeEnergyUI
+from app.fields import FieldExtractor, parse_spec
+from app.night import NightMode
+
 ui = HomeEnergyUI(display)
 
 
@@ -98,45 +136,98 @@ except Exception:
 
 
 # -------------------- JSON → UI mapping ----------------
-def map_values(payload: dict):
+# The field spec is compiled once; each poll is a few dict lookups plus a
+# single pass over payload["devices"] (see app/fields.py).
+FIELD_SPEC = os.getenv("SOLAR_MANAGER_FIELDS") or ""
+spec = C.FIELDS
+if FIELD_SPEC:
+    try:
+        spec = parse_spec(FIELD_SPEC)
+        if len(spec) < 4:
+            # map_values() needs house, solar, SoC and water temperature
+            raise ValueError("needs at least 4 fields, got %d" % len(spec))
+    except ValueError as e:
+        print("Ignoring SOLAR_MANAGER_FIELDS:", e)
+        spec = C.FIELDS
+extractor = FieldExtractor(spec, DEVICE_TEMP_ID)
+
+
+def map_values(snapshot: dict):
     """
-    Extract values from the API payload and return:
+    Extract values from the merged snapshot {endpoint name: payload} and return:
         (house_w, solar_w, batt_soc, water_temp_c)
     Notes:
       - Power values are in W (convert to kW only in the UI formatter).
-      - Temperature is read from the device with id == DEVICE_TEMP_ID (if set).
+      - The first four fields of the spec are shown; their names don't matter.
     """
-    house_w  = float(payload.get("cW", 0))   # consumption W
-    solar_w  = float(payload.get("pW", 0))   # PV W (use "pvW" if your API uses that)
-    batt_soc = int(payload.get("soc", 0))
+    v = extractor.extract_snapshot(snapshot, PRIMARY)
+    return v[0], v[1], int(v[2]), v[3]
+
+
+# -------------------- Endpoints ------------------------
+# API_URL is polled every POLL_INTERVAL_S; extra endpoints from settings.toml
+# bring their own period. Each cycle fetches only what is due.
+endpoints = [(PRIMARY, API_URL, C.POLL_INTERVAL_S)]
+try:
+    endpoints += net.parse_endpoints(EXTRA_ENDPOINTS, C.POLL_INTERVAL_S)
+except ValueError as e:
+    print("Ignoring SOLAR_MANAGER_EXTRA_ENDPOINTS:", e)
+fetcher = net.FetchCoordinator(http, endpoints, budget=C.HTTP_SOCKET_BUDGET,
+                               timeout=C.HTTP_TIMEOUT_S)
+
+
+# -------------------- Night mode -----------------------
+night = NightMode(time_source=net.get_epoch if http else None)
 
-    water_temp = 0.0
-    if DEVICE_TEMP_ID:
-        for d in payload.get("devices", []):
-            if d.get("_id") == DEVICE_TEMP_ID and ("temperature" in d):
-                water_temp = float(d["temperature"])
-                break
 
-    return house_w, solar_w, batt_soc, water_temp
+# -------------------- Boot report ----------------------
+# Time from the start of code.py without the Wi-Fi join and the banner scroll
+# (both vary or are fixed delays; shown separately), and free heap once
+# everything is loaded. Compare with and without the .mpy build (tools/build_mpy.py).
+gc.collect()
+print("Boot: ready %.2f s (+ Wi-Fi %.2f s, banner %.2f s), free %d bytes"
+      % (time.monotonic() - T_START - T_WIFI - T_BANNER, T_WIFI, T_BANNER, gc.mem_free()))
 
 
 # -------------------- Main loop ------------------------
 last_values = (0.0, 0.0, 0, 0.0)  # safe initial state
+poll_count = 0
 
 while True:
     t0 = time.monotonic()
     try:
-        if http and API_URL:
-            data = net.fetch_json(http, API_URL, timeout=C.HTTP_TIMEOUT_S)
-            last_values = map_values(data or {})
-        # if offline or no URL, keep last_values
+        if http:
+            snapshot = fetcher.poll(t0)
+            if snapshot:
+                last_values = map_values(snapshot)
+            poll_count += 1
+            if C.STATS_EVERY_N_POLLS and poll_count % C.STATS_EVERY_N_POLLS == 0:
+                st = net.http_stats()
+                print("HTTP: %d requests, reuse %.0f%%, %d reconnects, setup ~%.3f s"
+                      % (st["requests"], st["reuse_ratio"] * 100, st["reconnects"], st["setup_s"]))
+                for name, (latency, age, errors) in fetcher.stats().items():
+                    age_txt = "never" if age is None else "%.0f s ago" % age
+                    print("  %s: %.3f s, last ok %s, %d errors" % (name, latency, age_txt, errors))
+        # if offline or nothing fetched yet, keep last_values
         ui.update(*last_values)
     except Exception:
         # keep previous on screen; try again next cycle
         ui.update(*last_values)
 
-    # simple cadence control
-    elapsed = time.monotonic() - t0
-    sleep_s = C.POLL_INTERVAL_S - elapsed
+    # Night mode: dim via precomputed palettes and poll less often
+    polls = night.polls
+    if night.update(last_values[0], last_values[1], t0):
+        ui.set_night(night.active)
+        if night.active:
+            print("Night mode on")
+        else:
+            print("Night mode off after", polls, "polls")
+
+    # simple cadence control: by day wake up when the next endpoint is due,
+    # at night only every NIGHT_POLL_INTERVAL_S
+    now = time.monotonic()
+    sleep_s = night.poll_interval() - (now - t0)
+    if not night.active:
+        sleep_s = min(sleep_s, fetcher.next_due() - now)
     if sleep_s > 0:
         time.sleep(sleep_s)
@@ -10,6 +10,8 @@
 #   • layout geometry (margins, coordinates, spacing)
 #   • fine optical corrections ("nudges")
 #   • network polling intervals and timeouts (non-sensitive behavior)
+#   • night mode schedule, dimming factor and poll stretching
+#   • the default field spec (which JSON values feed the display)
 #
 # Design principle
 # ----------------
@@ -27,10 +29,13 @@
 # Naming conventions
 # ------------------
 #   ICON_*   → bitmap file paths
+#   FONT_*   → optional bitmap font file and its preloaded glyphs
 #   COL_*    → color constants
 #   *_W/H    → width or height in pixels
 #   *_Y      → y-position baseline for a row
 #   *_NUDGE  → small optical corrections (±1 px)
+#   NIGHT_*  → night mode behavior (app/night.py)
+#   FIELDS   → (name, path, scale, default) tuples for app/fields.py
 #
 # How this file is used
 # ---------------------
@@ -60,6 +65,18 @@ ICON_BATT_FULL  = ASSETS_DIR + "icon-battery-full.bmp"   # 6×10 pixels
 ICON_BATT_EMPTY = ASSETS_DIR + "icon-battery-empty.bmp"  # 6×10 pixels
 ICON_SHOWER     = ASSETS_DIR + "icon-shower.bmp"         # 8×10 pixels
 
+# Optional font for the numbers (BDF, PCF or LVGL .bin), e.g.
+#   FONT_PATH = ASSETS_DIR + "font-digits.bdf"
+# Empty → built-in terminalio font. Only FONT_GLYPHS are loaded (at boot),
+# so keep this in sync with what the UI can display.
+# Size limit: the glyphs must fit the 10 px rows (TOP_ICON_H) and every
+# character cell (widest glyph) may be at most 6 px wide, so that
+# POWER_MAX_CHARS cells fit next to the icons (8 × 6 = 48 of 51 px).
+# A font that does not fit is ignored at boot with a warning on the console.
+# FONT_GLYPHS are also the characters of the number glyph atlas (app/helpers.py).
+FONT_PATH   = ""
+FONT_GLYPHS = "0123456789 .kW%C-"
+
 # -------------------- Colors -------------------------
 # Colors are defined in 24-bit RGB (0xRRGGBB).
 COL_WHITE  = 0xFFFFFF
@@ -70,10 +87,12 @@ COL_BLUE   = 0x50C8FF    # “ice blue” accent color
 
 # -------------------- Geometry / layout (pixels) -----
 # All coordinates are defined relative to the 64×32 matrix.
+DISPLAY_W     = 64
 LEFT_MARGIN   = 1
 RIGHT_MARGIN  = 1
 
 TOP_ICON_H     = 10   # Height of the two upper icon rows
+TOP_ICON_W     = 10   # Width of the house/sun icons
 BOTTOM_ICON_H  = 10   # Height of the bottom row
 SOC_ICON_W     = 6    # Battery icon width in pixels
 TEMP_ICON_W    = 8    # Shower/temperature icon width
@@ -81,6 +100,7 @@ ROW_Y          = [0, 11]  # Y positions for the two upper rows
 BOTTOM_Y       = 22       # Y position for bottom row
 GAP_ICON_TEXT  = 1        # Horizontal space between icon and text
 DEG_W          = 3        # Width/height of degree dot bitmap (3×3 px)
+POWER_MAX_CHARS = 8       # Character cells of the power fields ("123.4 kW")
 
 # -------------------- Fine-tuning ("nudges") ---------
 # These sub-pixel shifts help text and symbols look visually balanced.
@@ -90,5 +110,38 @@ NUM_RIGHT_NUDGE = 1   # Nudge for numeric temperature alignment
 
 # -------------------- Network behavior ---------------
 # These are non-sensitive runtime settings (safe to store in code).
-POLL_INTERVAL_S = 60   # Seconds between HTTP fetches
-HTTP_TIMEOUT_S  = 5    # Timeout per HTTP request (seconds)
+POLL_INTERVAL_S     = 60   # Seconds between HTTP fetches
+HTTP_TIMEOUT_S      = 5    # Timeout per HTTP request (seconds)
+HTTP_SOCKET_BUDGET  = 2    # Max requests per poll cycle and open keep-alive hosts
+STATS_EVERY_N_POLLS = 60   # Print HTTP stats every N poll cycles (0 = never)
+
+# -------------------- Night mode ---------------------
+# See app/night.py. Dimming is done in software with palettes precomputed once.
+# With MATRIX_BIT_DEPTH = 2 each channel only has four levels (off, 1/3, 2/3,
+# full). Dimmed colors are rounded to these levels; a lit channel never goes
+# below 1/3, so NIGHT_DIM mostly decides which colors end at 1/3 vs. 2/3.
+MATRIX_BIT_DEPTH      = 2      # color bits per channel passed to Matrix()
+NIGHT_DIM             = 0.34   # brightness factor at night; 0 = blank screen
+NIGHT_START_H         = 23     # scheduled night start (local hour), None = no schedule
+NIGHT_END_H           = 6      # scheduled night end (local hour)
+UTC_OFFSET_H          = 1      # local time = UTC + offset (no DST handling)
+NIGHT_PV_ZERO_S       = 1800   # also go dark after PV has been 0 W this long
+NIGHT_POLL_INTERVAL_S = 300    # seconds between HTTP fetches at night
+NIGHT_WAKE_DELTA_W    = 1500   # consumption change (W) that wakes the display
+NIGHT_WAKE_HOLD_S     = 600    # stay awake at least this long after a wake-up
+NIGHT_CLOCK_RETRY_S   = 60     # retry reading the ESP32 clock after a failure
+
+# -------------------- Field spec ---------------------
+# Which values are read from the API payload (compiled once by app/fields.py).
+# Path "key" reads a top-level value; "<device_id>.<key>" reads a value from the
+# device in payload["devices"] with that _id. {TEMP_ID} is replaced by
+# SOLAR_MANAGER_DEVICE_TEMP_ID. Scale converts units (e.g. 0.001 for W → kW).
+# The first four names are what the UI shows; extra fields are extracted too.
+# Override in settings.toml with SOLAR_MANAGER_FIELDS (see settings.example.toml).
+FIELDS = (
+    # name      path                     scale  default
+    ("house",   "cW",                    1.0,   0.0),   # consumption W
+    ("solar",   "pW",                    1.0,   0.0),   # PV W
+    ("soc",     "soc",                   1.0,   0.0),   # battery %
+    ("water",   "{TEMP_ID}.temperature", 1.0,   0.0),   # water °C
+)
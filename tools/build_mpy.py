@@ -0,0 +1,165 @@
+# -----------------------------------------------------------------------------
+# Tool: Build precompiled firmware files (runs on your computer, not the board)
+#
+# Purpose
+# -------
+# On every boot CircuitPython compiles `config.py` and `app/*.py` from source
+# on the SAMD51. That costs boot time and heap for the compiler. This script
+# produces a ready-to-copy `build/CIRCUITPY/` folder where:
+#
+#   • config values are folded in:
+#       - integer settings in config.py become `micropython.const(...)`
+#       - every `C.NAME` in app/*.py and code.py that refers to a plain number,
+#         string, bool or None in config.py is replaced by its value, so the
+#         board no longer looks them up at runtime
+#   • rewriting works on the syntax tree (ast), so comments and strings are
+#     never touched; the rewritten files are regenerated without comments
+#   • config.py and app/*.py are compiled to `.mpy` bytecode with `mpy-cross`
+#   • code.py stays a source file (CircuitPython always starts code.py)
+#   • everything else (lib/, assets, settings files) is copied unchanged
+#
+# Requirements
+# ------------
+# Python 3.9+ on your computer (for ast.unparse).
+# `mpy-cross` must match the CircuitPython major version on the board (10.x).
+# Download it from:
+#   https://adafruit-circuit-python.s3.amazonaws.com/index.html?prefix=bin/mpy-cross/
+# and put it on your PATH or pass --mpy-cross /path/to/mpy-cross.
+#
+# Usage
+# -----
+#   python tools/build_mpy.py                 # → build/CIRCUITPY/
+#   python tools/build_mpy.py --no-mpy        # fold config only, keep .py files
+#
+# Then copy the contents of build/CIRCUITPY/ onto the CIRCUITPY drive. Remove
+# old app/*.py and config.py from the drive first: a .py file next to a .mpy
+# with the same name takes precedence.
+# -----------------------------------------------------------------------------
+
+import argparse
+import ast
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, "CIRCUITPY")
+OUT = os.path.join(ROOT, "build", "CIRCUITPY")
+
+def load_config(path: str) -> dict:
+    """Execute config.py (constants only) and return its public values."""
+    ns = {}
+    with open(path, encoding="utf-8") as f:
+        exec(compile(f.read(), path, "exec"), ns)
+    return {k: v for k, v in ns.items() if k.isupper()}
+
+
+def foldable(value) -> bool:
+    """Values that can be written back as a literal."""
+    return value is None or isinstance(value, (bool, int, float, str))
+
+
+class ConstConfig(ast.NodeTransformer):
+    """Wrap top-level `NAME = <int>` assignments of config.py in const()."""
+
+    def visit_Module(self, node):
+        for stmt in node.body:
+            if (isinstance(stmt, ast.Assign)
+                    and all(isinstance(t, ast.Name) and t.id.isupper() for t in stmt.targets)
+                    and isinstance(stmt.value, ast.Constant)
+                    and type(stmt.value.value) is int):
+                stmt.value = ast.Call(func=ast.Name("const", ast.Load()),
+                                      args=[stmt.value], keywords=[])
+        return node
+
+
+class InlineConfig(ast.NodeTransformer):
+    """Replace `C.NAME` loads by the literal value of NAME from config.py."""
+
+    def __init__(self, values: dict):
+        self.values = values
+        self.count = 0
+
+    def visit_Compare(self, node):
+        # Leave identity checks like `C.X is None` alone: `23 is None` would
+        # compare a literal by identity.
+        if any(isinstance(op, (ast.Is, ast.IsNot)) for op in node.ops):
+            return node
+        return self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if (isinstance(node.value, ast.Name) and node.value.id == "C"
+                and isinstance(node.ctx, ast.Load)
+                and node.attr in self.values and foldable(self.values[node.attr])):
+            self.count += 1
+            return ast.copy_location(ast.Constant(self.values[node.attr]), node)
+        return self.generic_visit(node)
+
+
+def fold_config_source(text: str) -> str:
+    """Return config.py with integer constants wrapped in const()."""
+    tree = ConstConfig().visit(ast.parse(text))
+    return "from micropython import const\n" + ast.unparse(tree) + "\n"
+
+
+def inline_config_refs(text: str, values: dict):
+    """Replace `C.NAME` by its literal value; return (new_text, count)."""
+    inliner = InlineConfig(values)
+    tree = inliner.visit(ast.parse(text))
+    return ast.unparse(tree) + "\n", inliner.count
+
+
+def mpy_compile(mpy_cross: str, src_py: str, dst_mpy: str):
+    subprocess.run([mpy_cross, "-o", dst_mpy, src_py], check=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Build precompiled CIRCUITPY files.")
+    ap.add_argument("--mpy-cross", default=shutil.which("mpy-cross"),
+                    help="path to mpy-cross (default: from PATH)")
+    ap.add_argument("--no-mpy", action="store_true",
+                    help="only fold config values, keep .py sources")
+    ap.add_argument("--out", default=OUT, help="output folder (default: build/CIRCUITPY)")
+    args = ap.parse_args()
+
+    if not args.no_mpy and not args.mpy_cross:
+        print("mpy-cross not found; install it or use --no-mpy (see header of this file)",
+              file=sys.stderr)
+        return 1
+
+    values = load_config(os.path.join(SRC, "config.py"))
+
+    if os.path.isdir(args.out):
+        shutil.rmtree(args.out)
+    shutil.copytree(SRC, args.out, ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+
+    # Source files to rewrite: config.py, app/*.py and code.py
+    targets = ["config.py", "code.py"]
+    targets += [os.path.join("app", f) for f in sorted(os.listdir(os.path.join(SRC, "app")))
+                if f.endswith(".py")]
+
+    inlined = 0
+    for rel in targets:
+        path = os.path.join(args.out, rel)
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if rel == "config.py":
+            text = fold_config_source(text)
+        else:
+            text, n = inline_config_refs(text, values)
+            inlined += n
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        # code.py must stay source; everything else becomes .mpy
+        if rel != "code.py" and not args.no_mpy:
+            mpy_compile(args.mpy_cross, path, path[:-3] + ".mpy")
+            os.remove(path)
+
+    print(f"Built {args.out}: {len(targets)} files, {inlined} config references inlined")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())